@@ -0,0 +1,78 @@
+-- よく使う絞り込み・並び替えのための index 一式
+-- app.py のクエリの形（check_query_plans.py に同じ形を列挙）に合わせている。
+-- 既存の add_*.sql で作成済みのものも IF NOT EXISTS で含め、このファイルだけで揃うようにする。
+-- Supabase SQL Editor で実行してください（再実行可）
+-- 実行後: python check_query_plans.py でローカル Postgres の実行計画を確認
+
+-- ============================================================
+-- reservations
+-- ============================================================
+-- 予約日時の範囲（一覧・空き枠・集計）
+CREATE INDEX IF NOT EXISTS reservations_reserved_at_idx ON public.reservations (reserved_at);
+-- ステータス単独（completed / canceled の絞り込み）
+CREATE INDEX IF NOT EXISTS reservations_status_idx ON public.reservations (status);
+-- 担当スタッフ × 日時（重複チェック・スタッフ別タイムライン）
+CREATE INDEX IF NOT EXISTS reservations_staff_name_idx ON public.reservations (staff_name);
+CREATE INDEX IF NOT EXISTS reservations_staff_name_reserved_at_idx ON public.reservations (staff_name, reserved_at);
+-- 患者 × 日時（カルテの予約履歴・次回予約）
+CREATE INDEX IF NOT EXISTS reservations_patient_id_idx ON public.reservations (patient_id);
+CREATE INDEX IF NOT EXISTS reservations_patient_id_reserved_at_idx ON public.reservations (patient_id, reserved_at);
+-- キャンセル以外の予約を日時で（空き枠・重複チェック）
+CREATE INDEX IF NOT EXISTS reservations_active_reserved_at_idx
+ON public.reservations (reserved_at)
+WHERE status <> 'canceled';
+-- キャンセル以外の院内予約を日時で（ベッド数チェック）
+CREATE INDEX IF NOT EXISTS reservations_in_house_active_reserved_at_idx
+ON public.reservations (reserved_at)
+WHERE place_type = 'in_house' AND status <> 'canceled';
+-- 完了予約を日時で（給与・特別給の集計）
+CREATE INDEX IF NOT EXISTS reservations_completed_reserved_at_idx
+ON public.reservations (reserved_at)
+WHERE status = 'completed';
+
+-- ============================================================
+-- staff_daily_reports / items / patients
+-- ============================================================
+CREATE INDEX IF NOT EXISTS staff_daily_reports_report_date_idx ON public.staff_daily_reports (report_date);
+CREATE INDEX IF NOT EXISTS staff_daily_reports_staff_name_idx ON public.staff_daily_reports (staff_name);
+-- スタッフ × 日付（1日1枚の取得・スタッフ別の月次）
+CREATE INDEX IF NOT EXISTS staff_daily_reports_staff_name_report_date_idx ON public.staff_daily_reports (staff_name, report_date);
+-- スタッフID × 日付（給与詳細の名前補完）
+CREATE INDEX IF NOT EXISTS staff_daily_reports_staff_id_report_date_idx ON public.staff_daily_reports (staff_id, report_date);
+
+-- 日報 → 勤務カード
+CREATE INDEX IF NOT EXISTS staff_daily_report_items_daily_report_id_idx ON public.staff_daily_report_items (daily_report_id);
+
+-- 勤務カード → 患者、予約 → 日報患者
+CREATE INDEX IF NOT EXISTS staff_daily_report_patients_item_id_idx ON public.staff_daily_report_patients (item_id);
+CREATE INDEX IF NOT EXISTS staff_daily_report_patients_reservation_id_idx ON public.staff_daily_report_patients (reservation_id);
+
+-- ============================================================
+-- staff_work_shifts
+-- ============================================================
+-- 日付 × スタッフ（予約可能スタッフ・日付一覧）
+CREATE INDEX IF NOT EXISTS staff_work_shifts_shift_date_staff_name_idx ON public.staff_work_shifts (shift_date, staff_name);
+
+-- ============================================================
+-- karte_logs
+-- ============================================================
+-- 患者ごとの施術記録を日付の新しい順に
+CREATE INDEX IF NOT EXISTS karte_logs_patient_id_date_idx ON public.karte_logs (patient_id, date DESC);
+
+-- ============================================================
+-- blogs
+-- ============================================================
+-- 記事ページ（slug で取得。重複時は新しい方）
+CREATE INDEX IF NOT EXISTS blogs_slug_created_at_idx ON public.blogs (slug, created_at DESC);
+-- 公開記事一覧
+CREATE INDEX IF NOT EXISTS blogs_published_created_at_idx
+ON public.blogs (created_at DESC)
+WHERE draft = false;
+
+ANALYZE public.reservations;
+ANALYZE public.staff_daily_reports;
+ANALYZE public.staff_daily_report_items;
+ANALYZE public.staff_daily_report_patients;
+ANALYZE public.staff_work_shifts;
+ANALYZE public.karte_logs;
+ANALYZE public.blogs;
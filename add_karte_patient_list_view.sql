@@ -0,0 +1,52 @@
+-- カルテ一覧（/admin/karte）のページング・検索用ビュー
+-- 一覧に必要な列だけを持ち、最終来院日は karte_logs から DB 側で求める（全ログをアプリに転送しない）。
+-- 前提: add_patients_phone_digits.sql（phone_digits）・add_hot_path_indexes.sql（karte_logs_patient_id_date_idx）を実行済み
+-- ビューが無い環境では app.py が patients テーブルから直接読む（最終来院日は表示中のページ分だけ取得）
+-- Supabase SQL Editor で実行してください（再実行可）
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE VIEW public.karte_patient_list
+WITH (security_invoker = true)
+AS
+SELECT
+    p.id,
+    p.name,
+    p.kana,
+    p.last_name,
+    p.first_name,
+    p.last_kana,
+    p.first_kana,
+    p.phone_digits,
+    p.birthday,
+    p.gender,
+    p.category,
+    p.vip_level,
+    p.introduced_by_patient_id,
+    p.created_at,
+    lv.last_visit_date,
+    COALESCE(p.vip_level, '') ILIKE '%star%' AS has_star,
+    COALESCE(p.vip_level, '') ILIKE '%clover%' AS has_clover,
+    -- VIP順の並び替え用（⭐️🍀 > ⭐️ > 🍀 > なし）
+    (CASE WHEN COALESCE(p.vip_level, '') ILIKE '%star%' THEN 2 ELSE 0 END
+     + CASE WHEN COALESCE(p.vip_level, '') ILIKE '%clover%' THEN 1 ELSE 0 END) AS vip_rank
+FROM public.patients p
+LEFT JOIN LATERAL (
+    -- karte_logs_patient_id_date_idx で患者ごとに先頭1件だけ読む
+    SELECT l.date AS last_visit_date
+    FROM public.karte_logs l
+    WHERE l.patient_id = p.id
+    ORDER BY l.date DESC
+    LIMIT 1
+) lv ON true;
+
+-- 管理画面（service_role）からのみ参照する
+REVOKE ALL ON public.karte_patient_list FROM anon, authenticated;
+GRANT SELECT ON public.karte_patient_list TO service_role;
+
+-- 名前・フリガナの部分一致検索（ilike '%...%'）用
+CREATE INDEX IF NOT EXISTS patients_name_trgm_idx ON public.patients USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS patients_kana_trgm_idx ON public.patients USING gin (kana gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS patients_phone_digits_trgm_idx ON public.patients USING gin (phone_digits gin_trgm_ops);
+
+COMMENT ON VIEW public.karte_patient_list IS 'カルテ一覧用：患者の一覧列＋最終来院日（karte_logs の最新日付）';
@@ -0,0 +1,14 @@
+-- patients に電話番号の数字だけを保持する生成列を追加（Web予約の既存患者照合用）
+-- 全角数字を半角にしてから数字以外を除去した値（app.py の phone_digits_index_key と同じ）。アプリ側での更新は不要。
+-- 候補の絞り込み用で、既存患者との照合自体は app.py 側で行う。
+-- 全角数字を考慮しない旧い式で作成済みの場合は alter_patients_phone_digits_fullwidth.sql を実行してください。
+ALTER TABLE public.patients
+ADD COLUMN IF NOT EXISTS phone_digits text
+GENERATED ALWAYS AS (
+    regexp_replace(translate(coalesce(phone, ''), '０１２３４５６７８９', '0123456789'), '[^0-9]', '', 'g')
+) STORED;
+
+-- 検索用index
+CREATE INDEX IF NOT EXISTS patients_phone_digits_idx ON public.patients (phone_digits);
+
+COMMENT ON COLUMN public.patients.phone_digits IS '電話番号（数字のみ・全角数字は半角にして phone から自動生成）';
@@ -0,0 +1,100 @@
+-- 売上・収支ダッシュボード用の集計関数（supabase_admin.rpc から呼ぶ）
+-- 行をアプリに転送して Python で合計する代わりに、DB 側で集計済みの行を返す。
+-- 前提: add_revenue_ledger.sql（revenue_ledger）を実行済みであること
+-- 関数が無い環境では app.py が従来どおり Python 側で集計する
+-- Supabase SQL Editor で実行してください
+
+-- 1. 売上台帳：月 × 勤務種別 × 支払方法 × 領収書 の合計（月次売上一覧の内訳用）
+CREATE OR REPLACE FUNCTION public.revenue_ledger_summary(p_from date, p_to date)
+RETURNS TABLE (
+    month integer,
+    work_type text,
+    payment_method text,
+    receipt_status text,
+    amount bigint,
+    patient_count bigint,
+    working_minutes bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        EXTRACT(MONTH FROM l.entry_date)::integer AS month,
+        l.work_type,
+        l.payment_method,
+        l.receipt_status,
+        SUM(l.amount)::bigint AS amount,
+        SUM(l.patient_count)::bigint AS patient_count,
+        SUM(l.working_minutes)::bigint AS working_minutes
+    FROM public.revenue_ledger l
+    WHERE l.entry_date BETWEEN p_from AND p_to
+    GROUP BY 1, 2, 3, 4
+$$;
+
+-- 2. 売上台帳：月 × スタッフ の合計（収支管理の月別売上・スタッフ別売上用）
+CREATE OR REPLACE FUNCTION public.revenue_ledger_staff_monthly(p_from date, p_to date)
+RETURNS TABLE (
+    month integer,
+    staff_name text,
+    staff_id uuid,
+    amount bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        EXTRACT(MONTH FROM l.entry_date)::integer AS month,
+        l.staff_name,
+        MAX(l.staff_id::text)::uuid AS staff_id,
+        SUM(l.amount)::bigint AS amount
+    FROM public.revenue_ledger l
+    WHERE l.entry_date BETWEEN p_from AND p_to
+    GROUP BY 1, 2
+$$;
+
+-- 3. 収支管理：請求書・経費・日報交通費・備品発注（到着済み）の 月 × 区分 合計
+--    source: invoice / expense / transportation / equipment
+--    category: 経費は expenses.category、交通費は transportation、備品は supplies
+CREATE OR REPLACE FUNCTION public.financial_year_monthly(p_year integer)
+RETURNS TABLE (
+    source text,
+    month integer,
+    category text,
+    amount numeric
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT 'invoice', i.month, NULL::text, SUM(COALESCE(i.total_amount, 0))::numeric
+    FROM public.invoices i
+    WHERE i.year = p_year
+    GROUP BY i.month
+    UNION ALL
+    SELECT 'expense', e.month, COALESCE(e.category, 'other'), SUM(COALESCE(e.amount, 0))::numeric
+    FROM public.expenses e
+    WHERE e.year = p_year
+    GROUP BY e.month, COALESCE(e.category, 'other')
+    UNION ALL
+    SELECT 'transportation', EXTRACT(MONTH FROM t.date)::integer, 'transportation', SUM(t.amount)::numeric
+    FROM public.staff_daily_report_transportations t
+    WHERE t.date BETWEEN make_date(p_year, 1, 1) AND make_date(p_year, 12, 31)
+    GROUP BY 2
+    UNION ALL
+    SELECT 'equipment', EXTRACT(MONTH FROM o.order_date)::integer, 'supplies', SUM(COALESCE(o.amount, 0))::numeric
+    FROM public.equipment_orders o
+    WHERE o.status = 'arrived'
+      AND o.order_date BETWEEN make_date(p_year, 1, 1) AND make_date(p_year, 12, 31)
+    GROUP BY 2
+$$;
+
+-- 管理画面（service_role）からのみ実行する
+REVOKE EXECUTE ON FUNCTION public.revenue_ledger_summary(date, date) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.revenue_ledger_staff_monthly(date, date) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.financial_year_monthly(integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.revenue_ledger_summary(date, date) TO service_role;
+GRANT EXECUTE ON FUNCTION public.revenue_ledger_staff_monthly(date, date) TO service_role;
+GRANT EXECUTE ON FUNCTION public.financial_year_monthly(integer) TO service_role;
+
+COMMENT ON FUNCTION public.revenue_ledger_summary(date, date) IS '売上台帳の 月×勤務種別×支払方法×領収書 合計';
+COMMENT ON FUNCTION public.revenue_ledger_staff_monthly(date, date) IS '売上台帳の 月×スタッフ 合計';
+COMMENT ON FUNCTION public.financial_year_monthly(integer) IS '収支管理の 請求書・経費・交通費・備品 の月別合計';
@@ -0,0 +1,33 @@
+-- 売上台帳（revenue_ledger）
+-- 日報 → 勤務カード → 日報患者 → 予約（支払方法・領収書）を
+-- 日付 × スタッフ × 勤務種別 × 支払方法 × 領収書 ごとに集計した行。
+-- app.py の refresh_revenue_ledger が日報・予約ステータスの書き込み時に該当日を作り直す。
+-- 作成後に既存データを取り込む: flask --app app rebuild-revenue-ledger --from 2024-01-01
+-- Supabase SQL Editor で実行してください
+
+CREATE TABLE IF NOT EXISTS public.revenue_ledger (
+    id BIGSERIAL PRIMARY KEY,
+    entry_date DATE NOT NULL,  -- 日報の日付
+    staff_name TEXT NOT NULL DEFAULT '',  -- スタッフ名（日報の staff_name）
+    staff_id UUID,  -- スタッフID（日報に記録されている場合）
+    work_type TEXT NOT NULL DEFAULT '',  -- in_house / visit / field
+    payment_method TEXT NOT NULL DEFAULT '',  -- 予約の支払方法（予約なし・未設定は空）
+    receipt_status TEXT NOT NULL DEFAULT '',  -- 予約の領収書（予約なし・未設定は空）
+    amount BIGINT NOT NULL DEFAULT 0,  -- 日報患者の金額合計
+    patient_count INTEGER NOT NULL DEFAULT 0,  -- 日報患者数
+    working_minutes INTEGER NOT NULL DEFAULT 0,  -- 実働時間（分）。支払方法・領収書が空の行に計上
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 1日 × キーで1行
+CREATE UNIQUE INDEX IF NOT EXISTS revenue_ledger_key_idx
+ON public.revenue_ledger (entry_date, staff_name, work_type, payment_method, receipt_status);
+
+-- 検索用index
+CREATE INDEX IF NOT EXISTS revenue_ledger_staff_date_idx ON public.revenue_ledger (staff_name, entry_date);
+
+-- 管理画面（service_role）からのみ参照する
+ALTER TABLE public.revenue_ledger ENABLE ROW LEVEL SECURITY;
+REVOKE ALL ON public.revenue_ledger FROM anon, authenticated;
+
+COMMENT ON TABLE public.revenue_ledger IS '売上台帳（日付・スタッフ・勤務種別・支払方法・領収書ごとの集計）';
@@ -0,0 +1,74 @@
+-- patients.phone_digits の生成式を全角数字対応にする（add_patients_phone_digits.sql の旧い式で作成済みの環境向け）
+-- 旧い式は [0-9] 以外を除去するだけで、「０９０１２３４５６７８」のような電話番号が空文字になり
+-- Web予約の既存患者照合（find_patient_by_name_phone）で一致しなかった。
+-- 生成列の式は変更できないため列を作り直す。列を参照するビュー karte_patient_list（add_karte_patient_list_view.sql）は
+-- 一度削除し、このファイルの最後で同じ定義のまま作り直す（トランザクション内で行うので途中で一覧が壊れない）。
+-- Supabase SQL Editor で実行してください（再実行可）
+
+BEGIN;
+
+DROP VIEW IF EXISTS public.karte_patient_list;
+
+ALTER TABLE public.patients DROP COLUMN IF EXISTS phone_digits;
+
+ALTER TABLE public.patients
+ADD COLUMN phone_digits text
+GENERATED ALWAYS AS (
+    regexp_replace(translate(coalesce(phone, ''), '０１２３４５６７８９', '0123456789'), '[^0-9]', '', 'g')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS patients_phone_digits_idx ON public.patients (phone_digits);
+
+COMMENT ON COLUMN public.patients.phone_digits IS '電話番号（数字のみ・全角数字は半角にして phone から自動生成）';
+
+-- ============================================================
+-- karte_patient_list を作り直す（add_karte_patient_list_view.sql と同じ定義）
+-- ============================================================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE VIEW public.karte_patient_list
+WITH (security_invoker = true)
+AS
+SELECT
+    p.id,
+    p.name,
+    p.kana,
+    p.last_name,
+    p.first_name,
+    p.last_kana,
+    p.first_kana,
+    p.phone_digits,
+    p.birthday,
+    p.gender,
+    p.category,
+    p.vip_level,
+    p.introduced_by_patient_id,
+    p.created_at,
+    lv.last_visit_date,
+    COALESCE(p.vip_level, '') ILIKE '%star%' AS has_star,
+    COALESCE(p.vip_level, '') ILIKE '%clover%' AS has_clover,
+    -- VIP順の並び替え用（⭐️🍀 > ⭐️ > 🍀 > なし）
+    (CASE WHEN COALESCE(p.vip_level, '') ILIKE '%star%' THEN 2 ELSE 0 END
+     + CASE WHEN COALESCE(p.vip_level, '') ILIKE '%clover%' THEN 1 ELSE 0 END) AS vip_rank
+FROM public.patients p
+LEFT JOIN LATERAL (
+    -- karte_logs_patient_id_date_idx で患者ごとに先頭1件だけ読む
+    SELECT l.date AS last_visit_date
+    FROM public.karte_logs l
+    WHERE l.patient_id = p.id
+    ORDER BY l.date DESC
+    LIMIT 1
+) lv ON true;
+
+-- 管理画面（service_role）からのみ参照する
+REVOKE ALL ON public.karte_patient_list FROM anon, authenticated;
+GRANT SELECT ON public.karte_patient_list TO service_role;
+
+-- 名前・フリガナの部分一致検索（ilike '%...%'）用
+CREATE INDEX IF NOT EXISTS patients_name_trgm_idx ON public.patients USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS patients_kana_trgm_idx ON public.patients USING gin (kana gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS patients_phone_digits_trgm_idx ON public.patients USING gin (phone_digits gin_trgm_ops);
+
+COMMENT ON VIEW public.karte_patient_list IS 'カルテ一覧用：患者の一覧列＋最終来院日（karte_logs の最新日付）';
+
+COMMIT;